@@ -1,4 +1,5 @@
 # Library functions for PNR and Train Status
+from .http_client import *
 from .pnr import *
 from .train import *
 from .pnr_status_decoders import *
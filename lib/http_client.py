@@ -0,0 +1,45 @@
+# Shared httpx client for the upstream railway APIs.
+# Both the PNR and train-status modules talk to the same backend family, so
+# one process-wide client shares its TLS sessions, HTTP/2 streams and pool
+# limits across the whole workload.
+import asyncio
+import os
+
+import httpx
+
+_client: httpx.AsyncClient | None = None
+_client_lock = asyncio.Lock()
+
+
+async def get_client() -> httpx.AsyncClient:
+    """Return the process-wide httpx.AsyncClient, creating it lazily on first use."""
+    global _client
+    if _client is None:
+        async with _client_lock:
+            if _client is None:
+                # Pool config lives on the transport so it can also retry
+                # failed connection attempts; request-level retries (5xx/429)
+                # stay with the callers.
+                transport = httpx.AsyncHTTPTransport(
+                    http2=True,
+                    retries=2,
+                    limits=httpx.Limits(
+                        max_connections=int(os.getenv("PNR_MAX_CONNECTIONS", "128")),
+                        max_keepalive_connections=int(os.getenv("PNR_MAX_KEEPALIVE_CONNECTIONS", "32")),
+                        keepalive_expiry=60.0,
+                    ),
+                )
+                _client = httpx.AsyncClient(
+                    transport=transport,
+                    follow_redirects=True,
+                    timeout=httpx.Timeout(connect=3.0, read=10.0, write=5.0, pool=2.0),
+                )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client. Intended for server shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,64 +1,209 @@
+import asyncio
+import random
+import time
+from operator import attrgetter
+
 import httpx
+import orjson
 from lib.schema.pnr import PNRResponse
 import os
 from datetime import datetime, date
+from functools import lru_cache
 from dotenv import load_dotenv
 from urllib.parse import unquote
 from lib.pnr_status_decoders import decode_ticket_status, decode_berth
+from lib.http_client import get_client
 
 load_dotenv()
 
 PNR_API_PATH = os.getenv("NEW_PNR_API_PATH")
 PNR_API_KEY_NAME = os.getenv("NEW_PNR_API_KEY_NAME")
 
+# Constant for the life of the process, so build it once instead of per call
+_XSRF_HEADER_NAME = f"X-{PNR_API_KEY_NAME}" if PNR_API_KEY_NAME else None
+
+# Short-TTL cache so several PNR tools called back-to-back on the same PNR
+# (a very common chat pattern) hit upstream only once.
+PNR_CACHE_TTL_SECONDS = float(os.getenv("NEW_PNR_TTL_SECONDS", "30"))
+_PNR_CACHE_MAX_ENTRIES = 1024
+_pnr_cache: dict[str, tuple[float, PNRResponse]] = {}
+# In-flight upstream requests, keyed by PNR, for single-flight coalescing
+_inflight: dict[str, "asyncio.Task[PNRResponse | None]"] = {}
+
+# Bound concurrent upstream requests so bursty fan-out from MCP sessions
+# cannot exhaust the connection pool.
+_pnr_semaphore = asyncio.Semaphore(int(os.getenv("PNR_MAX_INFLIGHT", "16")))
+
+# Retry budget for transient upstream failures (transport errors, 5xx, 429)
+_PNR_MAX_ATTEMPTS = int(os.getenv("PNR_MAX_ATTEMPTS", "3"))
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def _backoff_delay(response: httpx.Response | None, attempt: int) -> float:
+    """Seconds to sleep before retry ``attempt + 1``, honouring Retry-After."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+    # Exponential backoff with jitter so coordinated clients don't retry in sync
+    return 0.5 * (2 ** attempt) + random.uniform(0, 0.25)
+
+
+_env_checked = False
+
+
+def _require_env() -> None:
+    """
+    Validate the PNR API env vars once, on first use. A clear RuntimeError
+    here beats an assert failing deep inside the POST (asserts also vanish
+    under ``python -O``).
+    """
+    global _env_checked
+    if not _env_checked:
+        if not PNR_API_PATH or not PNR_API_KEY_NAME:
+            raise RuntimeError("NEW_PNR_API_PATH and NEW_PNR_API_KEY_NAME must be set")
+        _env_checked = True
+
+
+# Status-prefix → icon for the PNR summary passenger lines
+_STATUS_ICON = {"CNF": "✅", "RAC": "🟡"}
+
+# Status prefixes that mean the passenger holds a berth; frozenset membership
+# is one hash probe with no per-check allocation
+_CONFIRMED_PREFIXES = frozenset({"CNF", "RAC"})
+
+# Bound template shared by the three per-passenger views, so the loop emits
+# each line through one prebuilt formatter instead of three f-string literals
+_PASSENGER_LINE = "Passenger-{}: {}\n".format
+
+# One C-level multi-attribute fetch per passenger in the fused loop below
+_PASSENGER_FIELDS = attrgetter(
+    "Number", "CurrentStatusNew", "CurrentCoachId",
+    "CurrentBerthNo", "CurrentBerthCode", "BookingStatusNew",
+)
+
 
 def is_confirmed_or_rac(status: str) -> bool:
     """Check if a status indicates confirmed or RAC."""
-    status_upper = status.upper().strip()
-    return status_upper.startswith('CNF') or status_upper.startswith('RAC')
+    return status.strip()[:3].upper() in _CONFIRMED_PREFIXES
+
+_token_lock = asyncio.Lock()
+
 
-def fetch_pnr_status(pnr_no: str) -> PNRResponse | None:
+async def _get_xsrf_token(client: httpx.AsyncClient, url: str) -> str:
+    """
+    Return the decoded XSRF token for the PNR API, bootstrapping it with a
+    GET only when the shared client's cookie jar does not already hold one.
+    """
+    api_key = client.cookies.get(PNR_API_KEY_NAME)
+    if not api_key:
+        async with _token_lock:
+            api_key = client.cookies.get(PNR_API_KEY_NAME)
+            if not api_key:
+                initial_response = await client.get(url)
+                api_key = client.cookies.get(PNR_API_KEY_NAME)
+                if not api_key:
+                    raise ValueError("Failed to retrieve XSRF-TOKEN from cookies", initial_response)
+    return unquote(api_key)
+
+
+async def _post_and_read(
+    client: httpx.AsyncClient, url: str, body: bytes, headers: dict[str, str]
+) -> tuple[httpx.Response, bytes]:
+    """
+    POST with a streamed response and read it into a single bytes buffer,
+    skipping httpx's eager content materialization on the request path.
+    """
+    async with client.stream("POST", url, content=body, headers=headers) as response:
+        raw = await response.aread()
+    return response, raw
+
+
+async def fetch_pnr_status(pnr_no: str) -> PNRResponse | None:
     """
     Fetch PNR status from Live API.
-    
+
     Args:
         pnr_no: The PNR number to check (must be 10 digits)
-        
+
     Returns:
         PNRResponse object containing the PNR status data, or None if PNR is invalid
     """
-    # Validate PNR length - must be exactly 10 digits
-    if len(pnr_no) != 10 or not pnr_no.isdigit():
+    # Validate PNR length - must be exactly 10 ASCII digits (isdigit alone
+    # also accepts Unicode digits the API rejects)
+    if len(pnr_no) != 10 or not pnr_no.isascii() or not pnr_no.isdigit():
         return None
-    
-    assert PNR_API_PATH is not None
-    assert PNR_API_KEY_NAME is not None
+
+    cached = _pnr_cache.get(pnr_no)
+    if cached is not None and (time.monotonic() - cached[0]) < PNR_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    # Single-flight: concurrent callers for the same PNR share one upstream
+    # request instead of racing past the cache miss together.
+    task = _inflight.get(pnr_no)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_pnr_status_upstream(pnr_no))
+        _inflight[pnr_no] = task
+        task.add_done_callback(lambda _t, _key=pnr_no: _inflight.pop(_key, None))
+    return await task
+
+
+async def _fetch_pnr_status_upstream(pnr_no: str) -> PNRResponse | None:
+    """Perform the actual upstream request for one PNR and cache the result."""
+    _require_env()
     url = PNR_API_PATH
-    
-    with httpx.Client() as client:
-        initial_response = client.get(url)
-        api_key = client.cookies.get(PNR_API_KEY_NAME)
 
-        if not api_key:
-            raise ValueError("Failed to retrieve XSRF-TOKEN from cookies", initial_response)
-        
-        decoded_token = unquote(api_key)
-        headers = {
-            f'X-{PNR_API_KEY_NAME}': decoded_token,
-        }
-        
-        body = {"pnr": pnr_no}
-        
-        response = client.post(url, json=body, headers=headers)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        # Check if API returned an error (PNR not found)
-        if data.get("status") is False:
-            return None
-        
-        return PNRResponse(**data)
+    client = await get_client()
+    # The token cookie is long-lived, so reuse it from the shared client's jar
+    # and only bootstrap with a GET when it is missing (or rejected below).
+    decoded_token = await _get_xsrf_token(client, url)
+    headers = {
+        _XSRF_HEADER_NAME: decoded_token,
+        "content-type": "application/json",
+    }
+
+    # Pre-encode the body so httpx skips its stdlib json serializer
+    body = orjson.dumps({"pnr": pnr_no})
+
+    async with _pnr_semaphore:
+        for attempt in range(_PNR_MAX_ATTEMPTS):
+            try:
+                response, raw = await _post_and_read(client, url, body, headers)
+            except httpx.TransportError:
+                if attempt + 1 == _PNR_MAX_ATTEMPTS:
+                    raise
+                await asyncio.sleep(_backoff_delay(None, attempt))
+                continue
+            if response.status_code in (401, 403):
+                # Token expired/rejected: clear it, re-bootstrap once and retry
+                client.cookies.delete(PNR_API_KEY_NAME)
+                headers[_XSRF_HEADER_NAME] = await _get_xsrf_token(client, url)
+                response, raw = await _post_and_read(client, url, body, headers)
+            if response.status_code in _RETRYABLE_STATUS and attempt + 1 < _PNR_MAX_ATTEMPTS:
+                await asyncio.sleep(_backoff_delay(response, attempt))
+                continue
+            break
+    response.raise_for_status()
+
+    # Validate straight from bytes in pydantic-core; no intermediate dict
+    result = PNRResponse.model_validate_json(raw)
+
+    # Check if API returned an error (PNR not found)
+    if result.status is False:
+        return None
+
+    if len(_pnr_cache) >= _PNR_CACHE_MAX_ENTRIES:
+        # Simple size cap: evict the oldest inserted entry
+        _pnr_cache.pop(next(iter(_pnr_cache)))
+    _pnr_cache[pnr_no] = (time.monotonic(), result)
+    return result
+
+
+@lru_cache(maxsize=256)
+def _parse_source_doj(source_doj: str) -> date:
+    """Parse a dd-mm-yyyy SourceDoj string; memoized since chained tool calls
+    on one PNR re-parse the same string repeatedly."""
+    return datetime.strptime(source_doj, "%d-%m-%Y").date()
 
 
 def get_train_start_date(pnr_status: PNRResponse | None) -> date | None:
@@ -75,8 +220,8 @@ def get_train_start_date(pnr_status: PNRResponse | None) -> date | None:
         return None
     
     try:
-        return datetime.strptime(pnr_status.data.SourceDoj, "%d-%m-%Y").date()
-    except (ValueError, AttributeError):
+        return _parse_source_doj(pnr_status.data.SourceDoj)
+    except (ValueError, AttributeError, TypeError):
         return None
 
 
@@ -96,98 +241,111 @@ def get_train_number(pnr_status: PNRResponse | None) -> str | None:
     return pnr_status.data.TrainNo
 
 
-def check_confirm_status(pnr_status: PNRResponse | None) -> str:
+def summarize_passenger_status(pnr_status: PNRResponse | None) -> tuple[str, str, str] | None:
     """
-    Check the confirmation status of all passengers in the PNR.
-    
+    Build the confirmation-status, coach/berth and waitlist strings for all
+    passengers in one pass. The three views are usually wanted together for
+    the same PNR, so fusing the loops decodes each passenger exactly once.
+
     Args:
         pnr_status: The PNRResponse object from fetch_pnr_status
-        
+
     Returns:
-        A formatted string with each passenger's confirmation status
+        A (confirm_status, coach_and_berth, waitlist_position) tuple, or None
+        when no PNR data is available
     """
     if pnr_status is None or pnr_status.data is None:
-        return "PNR data not available."
-    
+        return None
+
     passengers = pnr_status.data.PassengerStatus
     if not passengers:
-        return "No passenger information available."
-    
-    response = ""
+        return None
+
+    confirm: list[str] = []
+    coach: list[str] = []
+    waitlist: list[str] = []
+    # Local aliases: LOAD_FAST in the loop
+    _decode_berth = decode_berth
+    _decode_status = decode_ticket_status
     for p in passengers:
+        number, status_new, coach_id, berth_no, berth_code, booking_new = _PASSENGER_FIELDS(p)
+
         # Use CurrentStatusNew which contains the full formatted status
-        response += f"Passenger-{p.Number}: {p.CurrentStatusNew}\n"
-    
-    return response if response else "Confirm status not available."
+        confirm.append(_PASSENGER_LINE(number, status_new))
+
+        if p.is_confirmed_or_rac:
+            berth_desc = _decode_berth(berth_code) if berth_code else ""
+            coach_and_berth = f"Coach: {coach_id}, Berth: {berth_no}"
+            if berth_desc:
+                coach_and_berth += f" ({berth_desc})"
+            position = "Already Confirmed/RAC"
+        else:
+            coach_and_berth = "Not Confirmed"
+            # Parse booking status to get waitlist position
+            # BookingStatusNew contains the formatted status like "WL/12" or "GNWL/5";
+            # partition scans once and allocates no list
+            status_type, sep, rest = (booking_new or "").partition('/')
+            if sep:
+                position_num = rest.partition('/')[0]
+                position = f"Position {position_num} in {_decode_status(status_type)} ({status_type})"
+            else:
+                position = booking_new or "Unknown"
+
+        coach.append(_PASSENGER_LINE(number, coach_and_berth))
+        waitlist.append(_PASSENGER_LINE(number, position))
+
+    return "".join(confirm), "".join(coach), "".join(waitlist)
+
+
+def check_confirm_status(pnr_status: PNRResponse | None) -> str:
+    """
+    Check the confirmation status of all passengers in the PNR.
+
+    Args:
+        pnr_status: The PNRResponse object from fetch_pnr_status
+
+    Returns:
+        A formatted string with each passenger's confirmation status
+    """
+    summary = summarize_passenger_status(pnr_status)
+    if summary is None:
+        return "PNR data not available." if pnr_status is None or pnr_status.data is None \
+            else "No passenger information available."
+    return summary[0]
 
 
 def get_coach_and_berth(pnr_status: PNRResponse | None) -> str:
     """
     Get the coach and berth details for all passengers.
-    
+
     Args:
         pnr_status: The PNRResponse object from fetch_pnr_status
-        
+
     Returns:
         A formatted string with each passenger's coach and berth information
     """
-    if pnr_status is None or pnr_status.data is None:
-        return "PNR data not available."
-    
-    passengers = pnr_status.data.PassengerStatus
-    if not passengers:
-        return "No passenger information available."
-    
-    response = ""
-    for p in passengers:
-        if is_confirmed_or_rac(p.CurrentStatus):
-            berth_desc = decode_berth(p.CurrentBerthCode) if p.CurrentBerthCode else ""
-            coach_and_berth = f"Coach: {p.CurrentCoachId}, Berth: {p.CurrentBerthNo}"
-            if berth_desc:
-                coach_and_berth += f" ({berth_desc})"
-        else:
-            coach_and_berth = "Not Confirmed"
-        
-        response += f"Passenger-{p.Number}: {coach_and_berth}\n"
-    
-    return response if response else "Coach & Berth not available."
+    summary = summarize_passenger_status(pnr_status)
+    if summary is None:
+        return "PNR data not available." if pnr_status is None or pnr_status.data is None \
+            else "No passenger information available."
+    return summary[1]
 
 
 def get_waitlist_position(pnr_status: PNRResponse | None) -> str:
     """
     Get the waitlist position for passengers who are not confirmed or RAC.
-    
+
     Args:
         pnr_status: The PNRResponse object from fetch_pnr_status
-        
+
     Returns:
         A formatted string with each passenger's waitlist position
     """
-    if pnr_status is None or pnr_status.data is None:
-        return "PNR data not available."
-    
-    passengers = pnr_status.data.PassengerStatus
-    if not passengers:
-        return "No passenger information available."
-    
-    response = ""
-    for p in passengers:
-        if is_confirmed_or_rac(p.CurrentStatus):
-            position = "Already Confirmed/RAC"
-        else:
-            # Parse booking status to get waitlist position
-            # BookingStatusNew contains the formatted status like "WL/12" or "GNWL/5"
-            booking_parts = p.BookingStatusNew.split('/') if p.BookingStatusNew else []
-            if len(booking_parts) >= 2:
-                status_type = booking_parts[0]
-                position_num = booking_parts[1]
-                position = f"Position {position_num} in {decode_ticket_status(status_type)} ({status_type})"
-            else:
-                position = p.BookingStatusNew or "Unknown"
-        
-        response += f"Passenger-{p.Number}: {position}\n"
-    
-    return response if response else "Unable to get waitlist position."
+    summary = summarize_passenger_status(pnr_status)
+    if summary is None:
+        return "PNR data not available." if pnr_status is None or pnr_status.data is None \
+            else "No passenger information available."
+    return summary[2]
 
 
 def get_journey_overview(pnr_status: PNRResponse | None) -> str:
@@ -207,29 +365,33 @@ def get_journey_overview(pnr_status: PNRResponse | None) -> str:
     
     data = pnr_status.data
     
-    response = f"Train: {data.TrainName} ({data.TrainNo})\n"
-    response += f"Date of Journey: {data.Doj}\n"
-    response += f"Source Station: {data.SourceName} ({data.From})\n"
-    response += f"Destination Station: {data.DestinationName} ({data.To})\n"
-    response += f"Boarding Point: {data.BoardingStationName} ({data.BoardingPoint})\n"
-    response += f"Reservation Upto: {data.ReservationUptoName} ({data.ReservationUpto})\n"
-    response += f"Departure Time: {data.DepartureTime}\n"
-    response += f"Arrival Time: {data.ArrivalTime}\n"
-    response += f"Duration: {data.Duration}\n"
-    response += f"Booking Date: {data.BookingDate}\n"
-    response += f"Ticket Fare: ₹{data.TicketFare}\n"
-    response += f"Journey Class: {data.Class}\n"
-    response += f"Quota: {data.Quota}\n"
-    response += f"Number of Passengers: {data.PassengerCount}\n"
-    response += f"Expected Boarding Platform No.: {data.ExpectedPlatformNo}\n"
-    response += f"Chart Prepared: {'Yes' if data.ChartPrepared else 'No'}"
-    
+    # Adjacent literals fold into a single f-string at compile time,
+    # so the fixed layout is built in one allocation
+    response = (
+        f"Train: {data.TrainName} ({data.TrainNo})\n"
+        f"Date of Journey: {data.Doj}\n"
+        f"Source Station: {data.SourceName} ({data.From})\n"
+        f"Destination Station: {data.DestinationName} ({data.To})\n"
+        f"Boarding Point: {data.BoardingStationName} ({data.BoardingPoint})\n"
+        f"Reservation Upto: {data.ReservationUptoName} ({data.ReservationUpto})\n"
+        f"Departure Time: {data.DepartureTime}\n"
+        f"Arrival Time: {data.ArrivalTime}\n"
+        f"Duration: {data.Duration}\n"
+        f"Booking Date: {data.BookingDate}\n"
+        f"Ticket Fare: ₹{data.TicketFare}\n"
+        f"Journey Class: {data.Class}\n"
+        f"Quota: {data.Quota}\n"
+        f"Number of Passengers: {data.PassengerCount}\n"
+        f"Expected Boarding Platform No.: {data.ExpectedPlatformNo}\n"
+        f"Chart Prepared: {'Yes' if data.ChartPrepared else 'No'}"
+    )
+
     if data.HasPantry:
-        response += f"\nPantry Available: Yes"
-    
+        response += "\nPantry Available: Yes"
+
     if data.TrainCancelledFlag:
-        response += f"\n⚠️ TRAIN CANCELLED"
-    
+        response += "\n⚠️ TRAIN CANCELLED"
+
     return response
 
 
@@ -250,29 +412,31 @@ def get_passenger_summary(pnr_status: PNRResponse | None) -> str:
     if not passengers:
         return "No passenger information available."
     
-    response = f"Passengers ({len(passengers)}):\n\n"
-    
+    parts = [f"Passengers ({len(passengers)}):\n\n"]
+
+    _decode_berth = decode_berth  # local alias: LOAD_FAST in the loop
+    _append = parts.append
     for p in passengers:
-        response += f"Passenger {p.Number}:\n"
-        response += f"  Booking Status: {p.BookingStatusNew}\n"
-        response += f"  Current Status: {p.CurrentStatusNew}\n"
-        
-        if is_confirmed_or_rac(p.CurrentStatus):
-            berth_desc = decode_berth(p.CurrentBerthCode) if p.CurrentBerthCode else ""
+        _append(f"Passenger {p.Number}:\n")
+        _append(f"  Booking Status: {p.BookingStatusNew}\n")
+        _append(f"  Current Status: {p.CurrentStatusNew}\n")
+
+        if p.is_confirmed_or_rac:
+            berth_desc = _decode_berth(p.CurrentBerthCode) if p.CurrentBerthCode else ""
             coach_info = f"  Coach: {p.CurrentCoachId}, Berth: {p.CurrentBerthNo}"
             if berth_desc:
                 coach_info += f" ({berth_desc})"
-            response += coach_info + "\n"
-        
+            _append(coach_info + "\n")
+
         if p.Prediction and p.Prediction != 'CNF':
-            response += f"  Prediction: {p.Prediction}"
+            _append(f"  Prediction: {p.Prediction}")
             if p.PredictionPercentage:
-                response += f" ({p.PredictionPercentage}%)"
-            response += "\n"
-        
-        response += "\n"
-    
-    return response.strip()
+                _append(f" ({p.PredictionPercentage}%)")
+            _append("\n")
+
+        _append("\n")
+
+    return "".join(parts).strip()
 
 
 def get_pnr_summary(pnr_status: PNRResponse | None) -> str:
@@ -290,41 +454,39 @@ def get_pnr_summary(pnr_status: PNRResponse | None) -> str:
     
     data = pnr_status.data
     
-    result = f"PNR: {data.Pnr}\n"
-    result += f"{'=' * 40}\n\n"
-    
-    result += f"🚂 {data.TrainName} ({data.TrainNo})\n"
-    result += f"📅 {data.Doj}\n"
-    result += f"🚉 {data.SourceName} → {data.DestinationName}\n"
-    result += f"⏰ {data.DepartureTime} - {data.ArrivalTime} ({data.Duration})\n"
-    result += f"🎫 Class: {data.Class} | Quota: {data.Quota}\n"
-    result += f"💰 Fare: ₹{data.TicketFare}\n\n"
-    
+    parts = [
+        f"PNR: {data.Pnr}\n",
+        f"{'=' * 40}\n\n",
+        f"🚂 {data.TrainName} ({data.TrainNo})\n",
+        f"📅 {data.Doj}\n",
+        f"🚉 {data.SourceName} → {data.DestinationName}\n",
+        f"⏰ {data.DepartureTime} - {data.ArrivalTime} ({data.Duration})\n",
+        f"🎫 Class: {data.Class} | Quota: {data.Quota}\n",
+        f"💰 Fare: ₹{data.TicketFare}\n\n",
+    ]
+
     if data.ChartPrepared:
-        result += "✅ Chart Prepared\n\n"
+        parts.append("✅ Chart Prepared\n\n")
     else:
-        result += "⏳ Chart Not Prepared\n\n"
-    
+        parts.append("⏳ Chart Not Prepared\n\n")
+
     if data.TrainCancelledFlag:
-        result += "⚠️ TRAIN CANCELLED\n\n"
-    
-    result += f"Passengers ({data.PassengerCount}):\n"
+        parts.append("⚠️ TRAIN CANCELLED\n\n")
+
+    parts.append(f"Passengers ({data.PassengerCount}):\n")
+    _decode_berth = decode_berth  # local alias: LOAD_FAST in the loop
+    _append = parts.append
     for p in data.PassengerStatus:
-        status_upper = p.CurrentStatus.upper().strip()
-        if status_upper.startswith('CNF'):
-            status_icon = "✅"
-        elif status_upper.startswith('RAC'):
-            status_icon = "🟡"
-        else:
-            status_icon = "⏳"
-        result += f"  {status_icon} P{p.Number}: {p.CurrentStatusNew}"
-        if is_confirmed_or_rac(p.CurrentStatus):
-            berth_desc = decode_berth(p.CurrentBerthCode) if p.CurrentBerthCode else ""
-            result += f" - {p.CurrentCoachId}/{p.CurrentBerthNo}"
+        # CurrentStatus is normalized (upper/stripped) by the schema validator
+        status_icon = _STATUS_ICON.get(p.CurrentStatus[:3], "⏳")
+        _append(f"  {status_icon} P{p.Number}: {p.CurrentStatusNew}")
+        if p.is_confirmed_or_rac:
+            berth_desc = _decode_berth(p.CurrentBerthCode) if p.CurrentBerthCode else ""
+            _append(f" - {p.CurrentCoachId}/{p.CurrentBerthNo}")
             if berth_desc:
-                result += f" ({berth_desc})"
-        result += "\n"
-    
-    return result
+                _append(f" ({berth_desc})")
+        _append("\n")
+
+    return "".join(parts)
 
 
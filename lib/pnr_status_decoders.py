@@ -1,3 +1,5 @@
+import sys
+
 STATUS_MAP = {
     # Core Statuses
     "CNF": "Confirmed",
@@ -31,16 +33,36 @@ BERTH_MAP = {
     "AS": "Aisle Seat",  # Chair Car
 }
 
+# Intern the code keys so lookups on already-interned candidates (string
+# literals, short identifier-like API tokens) short-circuit to a pointer
+# compare before falling back to hash-equality
+STATUS_MAP = {sys.intern(k): v for k, v in STATUS_MAP.items()}
+BERTH_MAP = {sys.intern(k): v for k, v in BERTH_MAP.items()}
+
+# Bound .get methods: one LOAD_GLOBAL less per decode call
+_STATUS_GET = STATUS_MAP.get
+_BERTH_GET = BERTH_MAP.get
+
 def decode_ticket_status(status_code: str | None) -> str:
     if not status_code:
         return "Unknown Status"
-    
-    code = status_code.strip().upper()
 
-    return STATUS_MAP.get(code, f"Unknown Booking Status Code - ({code})")
+    # Fast path: API codes are almost always already canonical, so try the
+    # raw key before paying for strip().upper() temporaries
+    decoded = _STATUS_GET(status_code)
+    if decoded is not None:
+        return decoded
+
+    code = status_code.strip().upper()
+    return _STATUS_GET(code, f"Unknown Booking Status Code - ({code})")
 
 def decode_berth(berth_code: str | None) -> str:
     if not berth_code:
         return " "
+
+    decoded = _BERTH_GET(berth_code)
+    if decoded is not None:
+        return decoded
+
     code = berth_code.strip().upper()
-    return BERTH_MAP.get(code, f"Unknown Birth Code - {code}")
+    return _BERTH_GET(code, f"Unknown Birth Code - {code}")
@@ -1,8 +1,15 @@
-from pydantic import BaseModel
+from functools import cached_property
+
+from pydantic import BaseModel, ConfigDict, field_validator
 from typing import Optional
 
+# Status prefixes that mean the passenger holds a berth
+_CONFIRMED_PREFIXES = frozenset({"CNF", "RAC"})
+
 
 class PassengerStatus(BaseModel):
+    model_config = ConfigDict(extra='ignore', frozen=True)
+
     ReferenceId: Optional[str] = None
     Pnr: Optional[str] = None
     Number: int
@@ -25,8 +32,22 @@ class PassengerStatus(BaseModel):
     CurrentStatusNew: str
     CurrentStatusIndex: str
 
+    @field_validator("CurrentStatus", mode="after")
+    @classmethod
+    def _normalize_current_status(cls, v: str) -> str:
+        """Normalize once at load so downstream checks can skip string work."""
+        return v.strip().upper()
+
+    @cached_property
+    def is_confirmed_or_rac(self) -> bool:
+        """Whether the current status is confirmed or RAC; computed once per
+        passenger instead of re-deriving it in every formatter."""
+        return self.CurrentStatus[:3] in _CONFIRMED_PREFIXES
+
 
 class StationDetails(BaseModel):
+    model_config = ConfigDict(extra='ignore', frozen=True)
+
     category: str
     division: str
     latitude: str
@@ -37,6 +58,8 @@ class StationDetails(BaseModel):
 
 
 class PNRData(BaseModel):
+    model_config = ConfigDict(extra='ignore', frozen=True)
+
     Pnr: str
     TrainNo: str
     TrainName: str
@@ -82,6 +105,8 @@ class PNRData(BaseModel):
 
 
 class PNRResponse(BaseModel):
+    model_config = ConfigDict(extra='ignore', frozen=True)
+
     status: bool
     message: str
     timestamp: int
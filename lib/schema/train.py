@@ -1,20 +1,32 @@
-from pydantic import BaseModel, Field, ConfigDict
+from functools import cached_property
+
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from typing import Optional
+from typing_extensions import NotRequired, TypedDict
+
 
+# The leaf shapes below are plain TypedDicts rather than BaseModels: they
+# carry no methods or validators, and validating them as dicts avoids one
+# model allocation per entry (there can be hundreds of non-stops per route).
 
-class NonStopStation(BaseModel):
+class NonStopStation(TypedDict):
     """A non-stop station in the route."""
     si_no: int
     station_code: str
     station_name: str
-    is_diverted_station: bool = False
+    is_diverted_station: NotRequired[bool]
     distance_from_source: int
-    sta: str = ""
-    std: str = ""
+    sta: NotRequired[str]
+    std: NotRequired[str]
 
 
 class UpcomingStation(BaseModel):
     """An upcoming station in the train's route."""
+    # Never re-run validators when an already-validated instance is attached
+    # to a parent (pins the v2 default against config drift; routes can carry
+    # dozens of these per response)
+    model_config = ConfigDict(extra='ignore', frozen=True, revalidate_instances='never')
+
     si_no: int
     station_code: str
     station_name: str
@@ -37,17 +49,23 @@ class UpcomingStation(BaseModel):
     day: Optional[int] = None
     eta_a_min: Optional[int] = None
     food_available: Optional[bool] = None
-    non_stops: list[NonStopStation] = Field(default_factory=list)
+    non_stops: tuple[NonStopStation, ...] = ()
+
+    @field_validator("station_code", mode="after")
+    @classmethod
+    def _upper_station_code(cls, v: str) -> str:
+        """Normalize once at load so lookups can compare codes directly."""
+        return v.upper()
 
     def get_delay_hours_minutes(self) -> tuple[int, int]:
         """Get delay as (hours, minutes) tuple."""
-        hours = self.arrival_delay // 60
-        minutes = self.arrival_delay % 60
-        return hours, minutes
+        return divmod(self.arrival_delay, 60)
 
 
 class PreviousStation(BaseModel):
     """A previously passed station in the train's route."""
+    model_config = ConfigDict(extra='ignore', frozen=True, revalidate_instances='never')
+
     si_no: int
     station_code: str
     station_name: str
@@ -64,17 +82,23 @@ class PreviousStation(BaseModel):
     station_lat: float = 0.0
     station_lng: float = 0.0
     stoppage_number: Optional[int] = None
-    non_stops: list[NonStopStation] = Field(default_factory=list)
+    non_stops: tuple[NonStopStation, ...] = ()
 
+    @field_validator("station_code", mode="after")
+    @classmethod
+    def _upper_station_code(cls, v: str) -> str:
+        """Normalize once at load so lookups can compare codes directly."""
+        return v.upper()
 
-class BubbleMessage(BaseModel):
+
+class BubbleMessage(TypedDict):
     """Bubble message with current train status info."""
     station_name: str
     message_type: str
     station_time: str
 
 
-class NextStoppageInfo(BaseModel):
+class NextStoppageInfo(TypedDict):
     """Information about the next stoppage."""
     next_stoppage_title: str
     next_stoppage: str
@@ -82,18 +106,18 @@ class NextStoppageInfo(BaseModel):
     next_stoppage_delay: int
 
 
-class CurrentLocationInfo(BaseModel):
+class CurrentLocationInfo(TypedDict):
     """Current location information item."""
     type: int
-    deeplink: str = ""
-    img_url: str = ""
+    deeplink: NotRequired[str]
+    img_url: NotRequired[str]
     label: str
     message: str
     readable_message: str
     hint: str
 
 
-class TtbCard(BaseModel):
+class TtbCard(TypedDict):
     """Train ticket booking card information."""
     book_now_title: str
     rating: str
@@ -109,18 +133,14 @@ class TtbCard(BaseModel):
     text_4_icon: str
 
 
-class DfpCarousel(BaseModel):
-    """DFP Carousel (appears to be empty in examples)."""
-    pass
-
-
 class NewTrainStatusResponse(BaseModel):
     """Root response from the new train status API.
-    
+
     Note: This is a flat structure where all train data fields are at the root level
-    along with the success flag. We use a property to provide backward compatibility
-    with code that expects a 'data' attribute.
+    along with the success flag.
     """
+    model_config = ConfigDict(extra='ignore', frozen=True)
+
     success: bool = Field(alias="success")
     user_id: int = 0
     train_number: str
@@ -147,7 +167,7 @@ class NewTrainStatusResponse(BaseModel):
     halt: int = 0
     new_alert_id: int = 0
     new_alert_msg: str = ""
-    diverted_stations: Optional[list] = None
+    diverted_stations: tuple[str, ...] = ()
     primary_alert: int = 0
     instance_alert: int = 0
     related_alert: int = 0
@@ -179,29 +199,67 @@ class NewTrainStatusResponse(BaseModel):
     stoppage_number: int = 0
     a_day: int = 0
     status_as_of_min: int = 0
-    dfp_carousel: Optional[DfpCarousel] = None
-    upcoming_stations: list[UpcomingStation] = Field(default_factory=list)
-    previous_stations: list[PreviousStation] = Field(default_factory=list)
+    # DFP carousel is an empty object in every observed payload; keep it as a
+    # plain dict rather than a dedicated model or an Optional union
+    dfp_carousel: dict = Field(default_factory=dict)
+    upcoming_stations: tuple[UpcomingStation, ...] = ()
+    previous_stations: tuple[PreviousStation, ...] = ()
     personalized_food_deeplink: str = ""
-    travelling_from_lat_lng: list[str] = Field(default_factory=list)
-    travelling_to_lat_lng: list[str] = Field(default_factory=list)
+    # The API ships these as ["lat", "lng"] string pairs; parse to floats once
+    # at validation so consumers never re-parse
+    travelling_from_lat_lng: tuple[float, float] = (0.0, 0.0)
+    travelling_to_lat_lng: tuple[float, float] = (0.0, 0.0)
     bubble_message: Optional[BubbleMessage] = None
     next_stoppage_info: Optional[NextStoppageInfo] = None
-    current_location_info: list[CurrentLocationInfo] = Field(default_factory=list)
+    current_location_info: tuple[CurrentLocationInfo, ...] = ()
     ttb_card: Optional[TtbCard] = None
     spent_time: float = 0.0
     disclaimer: str = ""
 
-    @property
-    def data(self) -> "NewTrainStatusResponse":
-        """Backward compatibility: return self as 'data' for existing code."""
-        return self
+    @field_validator("current_station_code", mode="after")
+    @classmethod
+    def _upper_station_code(cls, v: str) -> str:
+        """Normalize once at load so lookups can compare codes directly."""
+        return v.upper()
+
+    @field_validator("diverted_stations", mode="before")
+    @classmethod
+    def _none_to_empty(cls, v):
+        """The API sends null for 'no diversions'; map it to the empty tuple."""
+        return () if v is None else v
+
+    @field_validator("travelling_from_lat_lng", "travelling_to_lat_lng", mode="before")
+    @classmethod
+    def _default_lat_lng(cls, v):
+        """Map null / empty pairs to the origin; string pairs coerce to float
+        via the tuple[float, float] validator itself."""
+        return (0.0, 0.0) if not v else v
+
+    @cached_property
+    def station_index(
+        self,
+    ) -> dict[str, tuple[str, "UpcomingStation | PreviousStation | NonStopStation"]]:
+        """
+        Uppercased station-code → ("upcoming" | "previous" | "nonstop", station)
+        index over the whole route, built once per response so station lookups
+        are O(1) instead of scanning three lists per query.
+        """
+        index: dict[str, tuple[str, UpcomingStation | PreviousStation | NonStopStation]] = {}
+        # Insert in lookup-priority order; setdefault keeps the first entry
+        for station in self.upcoming_stations:
+            if station.station_code:
+                index.setdefault(station.station_code, ("upcoming", station))
+        for station in self.previous_stations:
+            index.setdefault(station.station_code, ("previous", station))
+        for station in (*self.upcoming_stations, *self.previous_stations):
+            for non_stop in station.non_stops:
+                # TypedDict entries carry codes as-is, so normalize here
+                index.setdefault(non_stop["station_code"].upper(), ("nonstop", non_stop))
+        return index
 
     def get_delay_hours_minutes(self) -> tuple[int, int]:
         """Get current delay as (hours, minutes) tuple."""
-        hours = self.delay // 60
-        minutes = self.delay % 60
-        return hours, minutes
+        return divmod(self.delay, 60)
 
     def get_progress_percentage(self) -> float:
         """Get journey progress as percentage."""
@@ -215,12 +273,16 @@ class NewTrainStatusResponse(BaseModel):
 
 class StationSearchResult(BaseModel):
     """A station search result."""
+    model_config = ConfigDict(extra='ignore', frozen=True)
+
     code: str
     name: str
 
 
 class StationSearchResponse(BaseModel):
     """Response from station search API."""
+    model_config = ConfigDict(extra='ignore', frozen=True)
+
     success: bool
     data: list[StationSearchResult]
     total: int
@@ -229,7 +291,7 @@ class StationSearchResponse(BaseModel):
 
 class TrainSearchResult(BaseModel):
     """A train search result."""
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(extra='ignore', frozen=True, populate_by_name=True)
 
     number: str
     name: str
@@ -239,6 +301,8 @@ class TrainSearchResult(BaseModel):
 
 class TrainSearchResponse(BaseModel):
     """Response from train search API."""
+    model_config = ConfigDict(extra='ignore', frozen=True)
+
     success: bool
     data: list[TrainSearchResult]
     total: int
@@ -1,7 +1,13 @@
+import asyncio
+import logging
 import os
-from datetime import datetime, timezone, timedelta, date
+import time
+from operator import itemgetter
+from datetime import timezone, timedelta, date
+from functools import lru_cache
 from dotenv import load_dotenv
 import httpx
+from lib.http_client import get_client
 from lib.schema.train import (
     NewTrainStatusResponse,
     StationSearchResponse,
@@ -10,62 +16,134 @@ from lib.schema.train import (
     TrainSearchResult,
 )
 
-load_dotenv()
+# Read .env only when the config isn't already in the environment, so
+# deployed processes skip the disk probe at import
+if not (os.getenv("NEW_TRAIN_STATUS_API_BASE") and os.getenv("TRAIN_STATUS_API_BASE")):
+    load_dotenv()
+
+logger = logging.getLogger(__name__)
 
 NEW_TRAIN_STATUS_API_BASE = os.getenv("NEW_TRAIN_STATUS_API_BASE")
 TRAIN_STATUS_API_BASE = os.getenv("TRAIN_STATUS_API_BASE")
 
+# Search endpoint is fixed for the process life; build its URL once
+_SEARCH_URL = f"{TRAIN_STATUS_API_BASE}/search" if TRAIN_STATUS_API_BASE else None
+
+_env_checked = False
+
+
+def _require_env() -> None:
+    """
+    Validate the train API env vars once, on first use. Mirrors
+    lib.pnr._require_env: a clear RuntimeError beats per-call asserts that
+    vanish under ``python -O``.
+    """
+    global _env_checked
+    if not _env_checked:
+        if not NEW_TRAIN_STATUS_API_BASE or not TRAIN_STATUS_API_BASE:
+            raise RuntimeError(
+                "NEW_TRAIN_STATUS_API_BASE and TRAIN_STATUS_API_BASE must be set"
+            )
+        _env_checked = True
+
 # Indian Standard Time offset (UTC+5:30)
 IST = timezone(timedelta(hours=5, minutes=30))
 
+# Status-letter interpretation for the live-status feed
+_STATUS_MAP = {
+    "T": "In Transit",
+    "A": "Arrived",
+    "D": "Departed",
+    "S": "At Station",
+}
+
+# Short-TTL cache: one MCP session typically calls several train tools on the
+# same (train, start_day) back-to-back, and RailYatri itself only refreshes
+# every few minutes.
+TRAIN_STATUS_CACHE_TTL_SECONDS = float(os.getenv("NEW_TRAIN_STATUS_TTL_SECONDS", "45"))
+_TRAIN_STATUS_CACHE_MAX_ENTRIES = 256
+_train_status_cache: dict[tuple[str, int], tuple[float, NewTrainStatusResponse | None]] = {}
+# In-flight upstream requests for single-flight coalescing
+_train_inflight: dict[tuple[str, int], "asyncio.Task[NewTrainStatusResponse | None]"] = {}
+
+
 async def fetch_new_train_status(train_number: str, start_day: int = 0) -> NewTrainStatusResponse | None:
     """
     Fetch live train status from the RailYatri API.
-    
-    Note: the start_day parameter can change when the conversation is going on. 
-    hence is it recommended to consider absolute start date of train 
+
+    Note: the start_day parameter can change when the conversation is going on.
+    hence is it recommended to consider absolute start date of train
     and the current time to get it, every time we call this.
     also mention the date returned in the response to calculate start_day for future response
-    
+
     Args:
         train_number: The train number (e.g., "12138")
-        start_day: Days ago the train started from now (0 = today, 1 = yesterday, 2 = day before yesterday, etc.). mathematically, start_date = current_date - train_start_date  
-    
+        start_day: Days ago the train started from now (0 = today, 1 = yesterday, 2 = day before yesterday, etc.). mathematically, start_date = current_date - train_start_date
+
     Returns:
         NewTrainStatusResponse if successful, None otherwise
     """
-    assert NEW_TRAIN_STATUS_API_BASE is not None
+    key = (train_number, start_day)
+    cached = _train_status_cache.get(key)
+    if cached is not None and (time.monotonic() - cached[0]) < TRAIN_STATUS_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    # Single-flight: concurrent tool calls for the same train share one request
+    task = _train_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_new_train_status_upstream(train_number, start_day))
+        _train_inflight[key] = task
+        task.add_done_callback(lambda _t, _key=key: _train_inflight.pop(_key, None))
+    return await task
+
+
+async def _fetch_new_train_status_upstream(train_number: str, start_day: int) -> NewTrainStatusResponse | None:
+    """Perform the actual upstream request and cache the (possibly None) result."""
+    _require_env()
     url = f"{NEW_TRAIN_STATUS_API_BASE}/{train_number}/json"
     params = {
         "start_day": start_day
     }
 
-    async with httpx.AsyncClient(follow_redirects=True) as client:
-        try:
-            response = await client.get(url, params=params, timeout=30.0)
-            response.raise_for_status()
-            json_data = response.json()
-            # Check if API returned success=False
-            if json_data.get("success") is False:
-                return None
-            return NewTrainStatusResponse.model_validate(json_data)
-        except httpx.HTTPStatusError as e:
-            print(f"HTTP error fetching train status: {e}")
-            return None
-        except httpx.RequestError as e:
-            print(f"Request error fetching train status: {e}")
-            return None
-        except Exception as e:
-            print(f"Error parsing train status response: {e}")
-            return None
+    client = await get_client()
+    try:
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        # Validate straight from bytes in pydantic-core; no intermediate dict.
+        # Failure payloads that don't fit the schema raise and fall into the
+        # parsing except below, which also returns None.
+        parsed = NewTrainStatusResponse.model_validate_json(response.content)
+        result = None if parsed.success is False else parsed
+    except httpx.HTTPStatusError as e:
+        logger.warning("HTTP error fetching train status: %s", e)
+        return None
+    except httpx.RequestError as e:
+        logger.warning("Request error fetching train status: %s", e)
+        return None
+    except Exception as e:
+        logger.warning("Error parsing train status response: %s", e)
+        return None
+
+    # Cache the outcome (including a definitive success=False → None) so
+    # repeat tool calls within the TTL skip the network; transport/parse
+    # errors above are deliberately not cached.
+    if len(_train_status_cache) >= _TRAIN_STATUS_CACHE_MAX_ENTRIES:
+        _train_status_cache.pop(next(iter(_train_status_cache)))
+    _train_status_cache[(train_number, start_day)] = (time.monotonic(), result)
+    return result
 
+@lru_cache(maxsize=512)
 def format_delay(delay_minutes: int) -> str:
-    """Format delay in minutes to a human-readable string."""
+    """Format delay in minutes to a human-readable string.
+
+    Cached: a route render calls this once per station and real-world delay
+    values cluster in a small range, so most calls are cache hits.
+    """
     if delay_minutes == 0:
         return "On Time"
     elif delay_minutes > 0:
-        hours = delay_minutes // 60
-        mins = delay_minutes % 60
+        # One division for both quotient and remainder
+        hours, mins = divmod(delay_minutes, 60)
         if hours > 0:
             return f"Delayed by {hours}h {mins}m"
         return f"Delayed by {mins} mins"
@@ -86,10 +164,10 @@ def get_expected_arrival_at_station(train_status: NewTrainStatusResponse, statio
         A formatted string with arrival information
     """
     station_code_upper = station_code.upper()
-    data = train_status.data
+    data = train_status
     
     # Check if it's the current station
-    if data.current_station_code.upper() == station_code_upper:
+    if data.current_station_code == station_code_upper:
         result = f"Train is currently at/near {data.current_station_name} ({station_code_upper})\n"
         result += f"  Status: {data.status_as_of}\n"
         result += f"  Train Start Date: {data.train_start_date}\n"
@@ -99,9 +177,11 @@ def get_expected_arrival_at_station(train_status: NewTrainStatusResponse, statio
             result += f"  {format_delay(data.delay)}"
         return result
     
-    # Search in upcoming stations
-    for station in data.upcoming_stations:
-        if station.station_code.upper() == station_code_upper:
+    # Single O(1) lookup over the prebuilt route index
+    entry = data.station_index.get(station_code_upper)
+    if entry is not None:
+        kind, station = entry
+        if kind == "upcoming":
             result = f"Arrival at {station.station_name} ({station_code_upper}):\n"
             result += f"  Train Start Date: {data.train_start_date}\n"
             if station.sta:
@@ -115,10 +195,7 @@ def get_expected_arrival_at_station(train_status: NewTrainStatusResponse, statio
             if station.distance_from_current_station_txt:
                 result += f"  Distance: {station.distance_from_current_station_txt}"
             return result
-    
-    # Search in previous stations
-    for station in data.previous_stations:
-        if station.station_code.upper() == station_code_upper:
+        if kind == "previous":
             result = f"Train has already passed {station.station_name} ({station_code_upper}):\n"
             result += f"  Train Start Date: {data.train_start_date}\n"
             if station.sta:
@@ -130,14 +207,8 @@ def get_expected_arrival_at_station(train_status: NewTrainStatusResponse, statio
             if station.platform_number:
                 result += f"  Platform: {station.platform_number}"
             return result
-    
-    # Check in non-stop stations
-    all_stations = data.upcoming_stations + data.previous_stations
-    for station in all_stations:
-        for non_stop in station.non_stops:
-            if non_stop.station_code.upper() == station_code_upper:
-                return f"{non_stop.station_name} ({station_code_upper}) is a non-stop station. Train does not halt here."
-    
+        return f"{station['station_name']} ({station_code_upper}) is a non-stop station. Train does not halt here."
+
     return f"Station {station_code_upper} not found in the train's route (Train Start Date: {data.train_start_date})"
 
 
@@ -153,10 +224,10 @@ def get_expected_departure_at_station(train_status: NewTrainStatusResponse, stat
         A formatted string with departure information
     """
     station_code_upper = station_code.upper()
-    data = train_status.data
+    data = train_status
     
     # Check if it's the current station
-    if data.current_station_code.upper() == station_code_upper:
+    if data.current_station_code == station_code_upper:
         result = f"Train is currently at/near {data.current_station_name} ({station_code_upper})\n"
         result += f"  Status: {data.status_as_of}\n"
         result += f"  Train Start Date: {data.train_start_date}\n"
@@ -168,9 +239,11 @@ def get_expected_departure_at_station(train_status: NewTrainStatusResponse, stat
             result += f"  {format_delay(data.delay)}"
         return result
     
-    # Search in upcoming stations
-    for station in data.upcoming_stations:
-        if station.station_code.upper() == station_code_upper:
+    # Single O(1) lookup over the prebuilt route index
+    entry = data.station_index.get(station_code_upper)
+    if entry is not None:
+        kind, station = entry
+        if kind == "upcoming":
             result = f"Departure from {station.station_name} ({station_code_upper}):\n"
             result += f"  Train Start Date: {data.train_start_date}\n"
             if station.std:
@@ -186,10 +259,7 @@ def get_expected_departure_at_station(train_status: NewTrainStatusResponse, stat
             if station.distance_from_current_station_txt:
                 result += f"  Distance: {station.distance_from_current_station_txt}"
             return result
-    
-    # Search in previous stations
-    for station in data.previous_stations:
-        if station.station_code.upper() == station_code_upper:
+        if kind == "previous":
             result = f"Train has already departed from {station.station_name} ({station_code_upper}):\n"
             result += f"  Train Start Date: {data.train_start_date}\n"
             if station.std:
@@ -203,14 +273,9 @@ def get_expected_departure_at_station(train_status: NewTrainStatusResponse, stat
             if station.platform_number:
                 result += f"  Platform: {station.platform_number}"
             return result
-    
-    # Check in non-stop stations
-    all_stations = data.upcoming_stations + data.previous_stations
-    for station in all_stations:
-        for non_stop in station.non_stops:
-            if non_stop.station_code.upper() == station_code_upper:
-                return f"{non_stop.station_name} ({station_code_upper}) is a non-stop station. Train does not halt here."
-    
+        # Non-stop station (TypedDict entry)
+        return f"{station['station_name']} ({station_code_upper}) is a non-stop station. Train does not halt here."
+
     return f"Station {station_code_upper} not found in the train's route (Train Start Date: {data.train_start_date})"
 
 
@@ -224,55 +289,50 @@ def get_current_train_position(train_status: NewTrainStatusResponse) -> str:
     Returns:
         A formatted string with the train's current position details
     """
-    data = train_status.data
-    
-    result = f"Current Train Position - {data.train_name} ({data.train_number}):\n"
-    result += f"  Train Start Date: {data.train_start_date}\n"
-    result += f"  Route: {data.source_stn_name} ({data.source}) → {data.dest_stn_name} ({data.destination})\n"
-    result += "\n"
-    
-    # Current location
-    result += f"  Current Station: {data.current_station_name} ({data.current_station_code})\n"
-    
+    data = train_status
+    
+    parts = [
+        f"Current Train Position - {data.train_name} ({data.train_number}):\n",
+        f"  Train Start Date: {data.train_start_date}\n",
+        f"  Route: {data.source_stn_name} ({data.source}) → {data.dest_stn_name} ({data.destination})\n",
+        "\n",
+        # Current location
+        f"  Current Station: {data.current_station_name} ({data.current_station_code})\n",
+    ]
+
     # Status interpretation
-    status_map = {
-        "T": "In Transit",
-        "A": "Arrived",
-        "D": "Departed",
-        "S": "At Station",
-    }
-    status_text = status_map.get(data.status, data.status)
-    result += f"  Status: {status_text}\n"
-    
+    status_text = _STATUS_MAP.get(data.status, data.status)
+    parts.append(f"  Status: {status_text}\n")
+
     # Distance and progress
-    result += f"  Distance Covered: {data.distance_from_source} km / {data.total_distance} km\n"
-    result += f"  Progress: {data.get_progress_percentage():.1f}%\n"
-    
+    parts.append(f"  Distance Covered: {data.distance_from_source} km / {data.total_distance} km\n")
+    parts.append(f"  Progress: {data.get_progress_percentage():.1f}%\n")
+
     if data.ahead_distance_text:
-        result += f"  Position: {data.ahead_distance_text}\n"
-    
+        parts.append(f"  Position: {data.ahead_distance_text}\n")
+
     # Delay info
     if data.delay > 0:
         hours, mins = data.get_delay_hours_minutes()
         if hours > 0:
-            result += f"  Delay: {hours}h {mins}m\n"
+            parts.append(f"  Delay: {hours}h {mins}m\n")
         else:
-            result += f"  Delay: {mins} mins\n"
+            parts.append(f"  Delay: {mins} mins\n")
     elif data.delay == 0:
-        result += f"  Running: On Time\n"
-    
+        parts.append("  Running: On Time\n")
+
     # Next stoppage info
     if data.next_stoppage_info:
-        result += f"\n  Next Stop: {data.next_stoppage_info.next_stoppage} ({data.next_stoppage_info.next_stoppage_time_diff})\n"
-        if data.next_stoppage_info.next_stoppage_delay > 0:
-            result += f"  Next Stop Delay: {format_delay(data.next_stoppage_info.next_stoppage_delay)}\n"
-    
+        parts.append(f"\n  Next Stop: {data.next_stoppage_info['next_stoppage']} ({data.next_stoppage_info['next_stoppage_time_diff']})\n")
+        if data.next_stoppage_info["next_stoppage_delay"] > 0:
+            parts.append(f"  Next Stop Delay: {format_delay(data.next_stoppage_info['next_stoppage_delay'])}\n")
+
     # Last update time
-    result += f"\n  {data.status_as_of}"
+    parts.append(f"\n  {data.status_as_of}")
     if data.update_time:
-        result += f"\n  Last Updated: {data.update_time}"
-    
-    return result
+        parts.append(f"\n  Last Updated: {data.update_time}")
+
+    return "".join(parts)
 
 
 def get_train_route(train_status: NewTrainStatusResponse, include_non_stops: bool = False) -> str:
@@ -286,52 +346,53 @@ def get_train_route(train_status: NewTrainStatusResponse, include_non_stops: boo
     Returns:
         A formatted string showing all stations with names and codes in sequence
     """
-    data = train_status.data
-    
-    if not data.previous_stations and not data.upcoming_stations:
+    data = train_status
+    # Bind the route lists once; pydantic attribute access is pricier than a
+    # plain local
+    previous_stations = data.previous_stations
+    upcoming_stations = data.upcoming_stations
+
+    if not previous_stations and not upcoming_stations:
         return "No route information available"
-    
+
     # Collect all stoppage stations
     all_stations: list[tuple[int, str, str, bool]] = []  # (si_no, name, code, is_current)
-    
+
     # Add previous stations
-    for station in data.previous_stations:
+    for station in previous_stations:
         all_stations.append((station.si_no, station.station_name, station.station_code, False))
         if include_non_stops:
             for ns in station.non_stops:
-                all_stations.append((ns.si_no, f"[{ns.station_name}]", ns.station_code, False))
+                all_stations.append((ns["si_no"], f"[{ns['station_name']}]", ns["station_code"], False))
     
     # Add current station marker
     all_stations.append((data.si_no, data.current_station_name, data.current_station_code, True))
     
     # Add upcoming stations
-    for station in data.upcoming_stations:
+    for station in upcoming_stations:
         if station.station_code:  # Skip empty placeholder stations
             all_stations.append((station.si_no, station.station_name, station.station_code, False))
             if include_non_stops:
                 for ns in station.non_stops:
-                    all_stations.append((ns.si_no, f"[{ns.station_name}]", ns.station_code, False))
+                    all_stations.append((ns["si_no"], f"[{ns['station_name']}]", ns["station_code"], False))
     
-    # Sort by si_no
-    all_stations.sort(key=lambda x: x[0])
+    # Previous → current → upcoming is already in si_no order; only injected
+    # non-stop entries can perturb it, so sort just in that case
+    if include_non_stops:
+        all_stations.sort(key=itemgetter(0))
     
-    # Format each station
-    station_entries = []
-    for si_no, name, code, is_current in all_stations:
-        if is_current:
-            station_entries.append(f">>> {name} ({code}) <<<")
-        else:
-            station_entries.append(f"{name} ({code})")
-    
-    # Join with arrows
-    route_string = " -> ".join(station_entries)
+    # Format and join in one pass; no intermediate entries list
+    route_string = " -> ".join(
+        f">>> {name} ({code}) <<<" if is_current else f"{name} ({code})"
+        for _si_no, name, code, is_current in all_stations
+    )
     
     # Include train start date for start_day calculation
-    result = f"Train: {data.train_name} ({data.train_number})\n"
-    result += f"Train Start Date: {data.train_start_date}\n\n"
-    result += route_string
-    
-    return result
+    return (
+        f"Train: {data.train_name} ({data.train_number})\n"
+        f"Train Start Date: {data.train_start_date}\n\n"
+        f"{route_string}"
+    )
 
 
 def get_upcoming_stations(train_status: NewTrainStatusResponse, limit: int = 5) -> str:
@@ -345,47 +406,51 @@ def get_upcoming_stations(train_status: NewTrainStatusResponse, limit: int = 5)
     Returns:
         A formatted string with upcoming station details
     """
-    data = train_status.data
+    data = train_status
     
     if not data.upcoming_stations:
         return "No upcoming stations available"
     
-    result = f"Upcoming Stations for {data.train_name} ({data.train_number}):\n"
-    result += f"Train Start Date: {data.train_start_date}\n\n"
-    
+    parts = [
+        f"Upcoming Stations for {data.train_name} ({data.train_number}):\n",
+        f"Train Start Date: {data.train_start_date}\n\n",
+    ]
+
     count = 0
+    remaining = 0
     for station in data.upcoming_stations:
         if not station.station_code:  # Skip empty placeholder
             continue
         if count >= limit:
-            break
-        
-        result += f"  {count + 1}. {station.station_name} ({station.station_code})\n"
+            # Past the display limit: just tally instead of re-filtering later
+            remaining += 1
+            continue
+
+        parts.append(f"  {count + 1}. {station.station_name} ({station.station_code})\n")
         if station.sta and station.eta:
-            result += f"     Scheduled: {station.sta} | Expected: {station.eta}\n"
+            parts.append(f"     Scheduled: {station.sta} | Expected: {station.eta}\n")
         elif station.sta:
-            result += f"     Scheduled: {station.sta}\n"
-        
+            parts.append(f"     Scheduled: {station.sta}\n")
+
         if station.arrival_delay != 0:
-            result += f"     {format_delay(station.arrival_delay)}\n"
-        
+            parts.append(f"     {format_delay(station.arrival_delay)}\n")
+
         if station.platform_number:
-            result += f"     Platform: {station.platform_number}\n"
-        
+            parts.append(f"     Platform: {station.platform_number}\n")
+
         if station.distance_from_current_station_txt:
-            result += f"     {station.distance_from_current_station_txt}\n"
-        
+            parts.append(f"     {station.distance_from_current_station_txt}\n")
+
         if station.halt > 0:
-            result += f"     Halt: {station.halt} min\n"
-        
-        result += "\n"
+            parts.append(f"     Halt: {station.halt} min\n")
+
+        parts.append("\n")
         count += 1
-    
-    remaining = len([s for s in data.upcoming_stations if s.station_code]) - count
+
     if remaining > 0:
-        result += f"  ... and {remaining} more stations"
-    
-    return result
+        parts.append(f"  ... and {remaining} more stations")
+
+    return "".join(parts)
 
 
 def get_train_summary(train_status: NewTrainStatusResponse) -> str:
@@ -398,35 +463,37 @@ def get_train_summary(train_status: NewTrainStatusResponse) -> str:
     Returns:
         A brief formatted summary string
     """
-    data = train_status.data
-    
-    result = f"{data.train_name} ({data.train_number})\n"
-    result += f"Train Start Date: {data.train_start_date}\n"
-    result += f"{data.source_stn_name} → {data.dest_stn_name}\n\n"
+    data = train_status
     
+    parts = [
+        f"{data.train_name} ({data.train_number})\n",
+        f"Train Start Date: {data.train_start_date}\n",
+        f"{data.source_stn_name} → {data.dest_stn_name}\n\n",
+    ]
+
     # Current position
     if data.bubble_message:
-        result += f"{data.bubble_message.message_type} {data.bubble_message.station_name}\n"
+        parts.append(f"{data.bubble_message['message_type']} {data.bubble_message['station_name']}\n")
     else:
-        result += f"Near {data.current_station_name}\n"
-    
+        parts.append(f"Near {data.current_station_name}\n")
+
     # Delay
     if data.delay > 0:
         hours, mins = data.get_delay_hours_minutes()
         if hours > 0:
-            result += f"Running late by {hours}h {mins}m\n"
+            parts.append(f"Running late by {hours}h {mins}m\n")
         else:
-            result += f"Running late by {mins} mins\n"
+            parts.append(f"Running late by {mins} mins\n")
     else:
-        result += f"Running on time\n"
-    
+        parts.append("Running on time\n")
+
     # Next stop
     if data.next_stoppage_info:
-        result += f"Next: {data.next_stoppage_info.next_stoppage} {data.next_stoppage_info.next_stoppage_time_diff}\n"
-    
-    result += f"\n{data.status_as_of}"
-    
-    return result
+        parts.append(f"Next: {data.next_stoppage_info['next_stoppage']} {data.next_stoppage_info['next_stoppage_time_diff']}\n")
+
+    parts.append(f"\n{data.status_as_of}")
+
+    return "".join(parts)
 
 
 def get_train_start_date(train_status: NewTrainStatusResponse) -> date | None:
@@ -440,8 +507,10 @@ def get_train_start_date(train_status: NewTrainStatusResponse) -> date | None:
         A date object representing when the train started, or None if parsing fails
     """
     try:
-        return datetime.strptime(train_status.data.train_start_date, "%Y-%m-%d").date()
-    except (ValueError, AttributeError):
+        # train_start_date is already ISO yyyy-mm-dd; fromisoformat's
+        # C parser is much faster than strptime
+        return date.fromisoformat(train_status.train_start_date)
+    except (ValueError, TypeError, AttributeError):
         return None
 
 
@@ -455,7 +524,7 @@ def get_last_stop_station(train_status: NewTrainStatusResponse) -> str:
     Returns:
         A formatted string with the last stop station details
     """
-    data = train_status.data
+    data = train_status
     
     if not data.previous_stations:
         return f"No previous stations available. Train may be at or near source station. (Train Start Date: {data.train_start_date})"
@@ -485,6 +554,26 @@ def get_last_stop_station(train_status: NewTrainStatusResponse) -> str:
 
 # UTILITIES:
 
+# Long-TTL cache for the search endpoints: the station/train directory is
+# effectively static, so a query's results can be reused for a day.
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", str(24 * 3600)))
+_SEARCH_CACHE_MAX_ENTRIES = 512
+_search_cache: dict[tuple[str, str, int], tuple[float, list]] = {}
+
+
+def _search_cache_get(key: tuple[str, str, int]) -> list | None:
+    cached = _search_cache.get(key)
+    if cached is not None and (time.monotonic() - cached[0]) < SEARCH_CACHE_TTL_SECONDS:
+        return cached[1]
+    return None
+
+
+def _search_cache_put(key: tuple[str, str, int], results: list) -> None:
+    if len(_search_cache) >= _SEARCH_CACHE_MAX_ENTRIES:
+        # Simple size cap: evict the oldest inserted entry
+        _search_cache.pop(next(iter(_search_cache)))
+    _search_cache[key] = (time.monotonic(), results)
+
 
 async def get_station_codes_from_name(station_name: str, limit: int = 8) -> list[StationSearchResult]:
     """
@@ -497,30 +586,38 @@ async def get_station_codes_from_name(station_name: str, limit: int = 8) -> list
     Returns:
         List of StationSearchResult with code and name
     """
-    assert TRAIN_STATUS_API_BASE is not None, "TRAIN_STATUS_API_BASE environment variable is not set"
-    
-    url = f"{TRAIN_STATUS_API_BASE}/search"
+    _require_env()
+
+    # Case-insensitive key so "Rani Kamla" and "rani kamla" share an entry
+    cache_key = ("station", station_name.strip().lower(), limit)
+    cached = _search_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    url = _SEARCH_URL
     params = {
         "type": "station",
         "q": station_name,
         "limit": limit
     }
 
-    async with httpx.AsyncClient(follow_redirects=True) as client:
-        try:
-            response = await client.get(url, params=params, timeout=30.0)
-            response.raise_for_status()
-            result = StationSearchResponse(**response.json())
-            return result.data
-        except httpx.HTTPStatusError as e:
-            print(f"HTTP error searching stations: {e}")
-            return []
-        except httpx.RequestError as e:
-            print(f"Request error searching stations: {e}")
-            return []
-        except Exception as e:
-            print(f"Error parsing station search response: {e}")
-            return []
+    client = await get_client()
+    try:
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        # Validate straight from bytes in pydantic-core; no intermediate dict
+        result = StationSearchResponse.model_validate_json(response.content)
+        _search_cache_put(cache_key, result.data)
+        return result.data
+    except httpx.HTTPStatusError as e:
+        logger.warning("HTTP error searching stations: %s", e)
+        return []
+    except httpx.RequestError as e:
+        logger.warning("Request error searching stations: %s", e)
+        return []
+    except Exception as e:
+        logger.warning("Error parsing station search response: %s", e)
+        return []
 
 
 async def get_train_numbers_from_name(train_name: str, limit: int = 8) -> list[TrainSearchResult]:
@@ -534,28 +631,35 @@ async def get_train_numbers_from_name(train_name: str, limit: int = 8) -> list[T
     Returns:
         List of TrainSearchResult with number, name, fromStnCode, and toStnCode
     """
-    assert TRAIN_STATUS_API_BASE is not None, "TRAIN_STATUS_API_BASE environment variable is not set"
-    
-    url = f"{TRAIN_STATUS_API_BASE}/search"
+    _require_env()
+
+    cache_key = ("train", train_name.strip().lower(), limit)
+    cached = _search_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    url = _SEARCH_URL
     params = {
         "type": "train",
         "q": train_name,
         "limit": limit
     }
 
-    async with httpx.AsyncClient(follow_redirects=True) as client:
-        try:
-            response = await client.get(url, params=params, timeout=30.0)
-            response.raise_for_status()
-            result = TrainSearchResponse(**response.json())
-            return result.data
-        except httpx.HTTPStatusError as e:
-            print(f"HTTP error searching trains: {e}")
-            return []
-        except httpx.RequestError as e:
-            print(f"Request error searching trains: {e}")
-            return []
-        except Exception as e:
-            print(f"Error parsing train search response: {e}")
-            return []
+    client = await get_client()
+    try:
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        # Validate straight from bytes in pydantic-core; no intermediate dict
+        result = TrainSearchResponse.model_validate_json(response.content)
+        _search_cache_put(cache_key, result.data)
+        return result.data
+    except httpx.HTTPStatusError as e:
+        logger.warning("HTTP error searching trains: %s", e)
+        return []
+    except httpx.RequestError as e:
+        logger.warning("Request error searching trains: %s", e)
+        return []
+    except Exception as e:
+        logger.warning("Error parsing train search response: %s", e)
+        return []
 
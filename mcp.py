@@ -1,5 +1,9 @@
+import asyncio
+import os
+
 from fastmcp import FastMCP
 from datetime import date, datetime, timezone, timedelta
+from functools import lru_cache
 from lib.pnr import (
     fetch_pnr_status,
     get_train_start_date as get_pnr_train_start_date,
@@ -30,20 +34,30 @@ mcp = FastMCP("Indian Railway Live Info (New)")
 IST = timezone(timedelta(hours=5, minutes=30))
 
 
-def calculate_start_day(train_source_date: date | None) -> int:
+@lru_cache(maxsize=256)
+def _parse_ddmmyyyy(value: str) -> date:
+    """Parse a dd-mm-yyyy string; memoized since a session tends to re-ask
+    about the same few dates and strptime re-parses its format every call."""
+    return datetime.strptime(value, "%d-%m-%Y").date()
+
+
+def calculate_start_day(train_source_date: date | None, today: date | None = None) -> int:
     """
     Calculate the start_day parameter for train status API.
-    
+
     Args:
         train_source_date: The date when the train departed from its source station
-        
+        today: Today's date; pass it in when the caller already has one so a
+            single consistent date is used across a request
+
     Returns:
         Number of days ago the train started (0 = today, 1 = yesterday, etc.)
     """
     if train_source_date is None:
         return 0  # Default to today if we can't determine
-    
-    today = date.today()
+
+    if today is None:
+        today = date.today()
     delta = today - train_source_date
     return max(0, delta.days)  # Ensure non-negative
 
@@ -77,8 +91,8 @@ def get_date_difference(date1: str, date2: str) -> str:
         The absolute difference in days between the two dates.
     """
     try:
-        d1 = datetime.strptime(date1, "%d-%m-%Y").date()
-        d2 = datetime.strptime(date2, "%d-%m-%Y").date()
+        d1 = _parse_ddmmyyyy(date1)
+        d2 = _parse_ddmmyyyy(date2)
         diff = abs((d2 - d1).days)
         return f"Difference between {date1} and {date2}: {diff} day(s)"
     except ValueError as e:
@@ -87,63 +101,71 @@ def get_date_difference(date1: str, date2: str) -> str:
 
 # ==================== PNR Status Tools ====================
 
+_PNR_ERROR = "Error fetching PNR status. Please double check the PNR number provided."
+
+
+def requires_pnr(fn):
+    """
+    Wrap a PNR tool so the fetch + None-check boilerplate lives in one place.
+    The wrapped function receives the parsed PNRResponse instead of the raw
+    PNR number; the tool's public signature stays `(pnr_no: str) -> str`.
+    """
+    async def wrapper(pnr_no: str) -> str:
+        response = await fetch_pnr_status(pnr_no)
+        if response is None:
+            return _PNR_ERROR
+        return fn(response)
+
+    wrapper.__name__ = fn.__name__
+    wrapper.__doc__ = fn.__doc__
+    return wrapper
+
+
 @mcp.tool(annotations={"readOnlyHint": True})
-def get_confirm_status(pnr_no: str) -> str:
+@requires_pnr
+def get_confirm_status(response) -> str:
     """
     Get Indian Railways ticket confirmation status of all passengers corresponding to a PNR Number.
     
     Args:
         pnr_no: 10-digit PNR code. (example: 8341223680)
     """
-    response = fetch_pnr_status(pnr_no)
-    if response is None:
-        return "Error fetching PNR status. Please double check the PNR number provided."
-    
     return check_confirm_status(response)
 
 
 @mcp.tool(annotations={"readOnlyHint": True})
-def get_coaches_and_berths(pnr_no: str) -> str:
+@requires_pnr
+def get_coaches_and_berths(response) -> str:
     """
     Get the Coach IDs (or numbers) and the Seat/Berth Details of all passengers corresponding to a PNR Number.
 
     Args: 
         pnr_no: 10-digit PNR code.
     """
-    response = fetch_pnr_status(pnr_no)
-    if response is None:
-        return "Error fetching PNR status. Please double check the PNR number provided."
-    
     return get_coach_and_berth(response)
 
 
 @mcp.tool(annotations={"readOnlyHint": True})
-def get_pnr_waitlist_position(pnr_no: str) -> str:
+@requires_pnr
+def get_pnr_waitlist_position(response) -> str:
     """
     Get the updated position of passengers in waiting list corresponding to a PNR Number.
 
     Args:
         pnr_no: 10-digit PNR Code.
     """
-    response = fetch_pnr_status(pnr_no)
-    if response is None:
-        return "Error fetching PNR status. Please double check the PNR number provided."
-    
     return get_waitlist_position(response)
 
 
 @mcp.tool(annotations={"readOnlyHint": True})
-def get_train_no_from_pnr_no(pnr_no: str) -> str:
+@requires_pnr
+def get_train_no_from_pnr_no(response) -> str:
     """
     Get the train number and name from a PNR Number.
 
     Args:
         pnr_no: 10-digit PNR Code.
     """
-    response = fetch_pnr_status(pnr_no)
-    if response is None:
-        return "Error fetching PNR status. Please double check the PNR number provided."
-    
     train_no = get_train_number(response)
     if train_no is None:
         return "Train number not available in PNR data."
@@ -153,7 +175,8 @@ def get_train_no_from_pnr_no(pnr_no: str) -> str:
 
 
 @mcp.tool(annotations={"readOnlyHint": True})
-def get_pnr_journey_overview(pnr_no: str) -> str:
+@requires_pnr
+def get_pnr_journey_overview(response) -> str:
     """
     Get basic journey information for a PNR - 
     source/destination stations, ticket fare, date/time of journey,
@@ -162,30 +185,24 @@ def get_pnr_journey_overview(pnr_no: str) -> str:
     Args:
         pnr_no: 10-digit PNR Code.
     """
-    response = fetch_pnr_status(pnr_no)
-    if response is None:
-        return "Error fetching PNR status. Please double check the PNR number provided."
-    
     return get_journey_overview(response)
 
 
 @mcp.tool(annotations={"readOnlyHint": True})
-def get_pnr_passenger_summary(pnr_no: str) -> str:
+@requires_pnr
+def get_pnr_passenger_summary(response) -> str:
     """
     Get a summary of all passengers with their current status, coach, and berth information.
 
     Args:
         pnr_no: 10-digit PNR Code.
     """
-    response = fetch_pnr_status(pnr_no)
-    if response is None:
-        return "Error fetching PNR status. Please double check the PNR number provided."
-    
     return get_passenger_summary(response)
 
 
 @mcp.tool(annotations={"readOnlyHint": True})
-def get_complete_pnr_summary(pnr_no: str) -> str:
+@requires_pnr
+def get_complete_pnr_summary(response) -> str:
     """
     Get a complete summary of the PNR including journey details and all passenger information.
     This is a comprehensive view of the entire PNR.
@@ -193,10 +210,6 @@ def get_complete_pnr_summary(pnr_no: str) -> str:
     Args:
         pnr_no: 10-digit PNR Code.
     """
-    response = fetch_pnr_status(pnr_no)
-    if response is None:
-        return "Error fetching PNR status. Please double check the PNR number provided."
-    
     return get_pnr_summary(response)
 
 
@@ -231,9 +244,9 @@ async def get_train_status_using_pnr(pnr_no: str) -> str:
         pnr_no: 10-digit PNR code
     """
     # First fetch PNR status to get train number and source date
-    pnr_response = fetch_pnr_status(pnr_no)
+    pnr_response = await fetch_pnr_status(pnr_no)
     if pnr_response is None:
-        return "Error fetching PNR status. Please double check the PNR number provided."
+        return _PNR_ERROR
     
     train_no = get_train_number(pnr_response)
     if train_no is None:
@@ -303,9 +316,9 @@ async def get_train_arrival_using_pnr(pnr_no: str, station_code: str) -> str:
         station_code: The station code to check arrival for (e.g., "HWH", "NDLS")
     """
     # Fetch PNR to get train number and source date
-    pnr_response = fetch_pnr_status(pnr_no)
+    pnr_response = await fetch_pnr_status(pnr_no)
     if pnr_response is None:
-        return "Error fetching PNR status. Please double check the PNR number provided."
+        return _PNR_ERROR
     
     train_no = get_train_number(pnr_response)
     if train_no is None:
@@ -336,8 +349,9 @@ async def get_train_complete_route(train_number: str, start_day: int = 0, includ
     response = await fetch_new_train_status(train_number, start_day)
     if response is None:
         return "Error fetching train status. Please check the train number and start_day."
-    
-    return get_train_route(response, include_non_stops)
+
+    # Full routes can run to hundreds of stations; format off the event loop
+    return await asyncio.to_thread(get_train_route, response, include_non_stops)
 
 
 @mcp.tool(annotations={"readOnlyHint": True})
@@ -403,10 +417,9 @@ async def search_station_codes(station_name: str) -> str:
     if not results:
         return f"No stations found matching '{station_name}'"
     
-    response = f"Stations matching '{station_name}':\n"
-    for station in results:
-        response += f"  • {station.name} - Code: {station.code}\n"
-    return response
+    lines = [f"Stations matching '{station_name}':"]
+    lines.extend(f"  • {station.name} - Code: {station.code}" for station in results)
+    return "\n".join(lines) + "\n"
 
 
 @mcp.tool(annotations={"readOnlyHint": True})
@@ -421,10 +434,12 @@ async def search_train_numbers(train_name: str) -> str:
     if not results:
         return f"No trains found matching '{train_name}'"
     
-    response = f"Trains matching '{train_name}':\n"
-    for train in results:
-        response += f"  • {train.number} - {train.name} ({train.from_stn_code} → {train.to_stn_code})\n"
-    return response
+    lines = [f"Trains matching '{train_name}':"]
+    lines.extend(
+        f"  • {train.number} - {train.name} ({train.from_stn_code} → {train.to_stn_code})"
+        for train in results
+    )
+    return "\n".join(lines) + "\n"
 
 
 # ==================== Combined PNR + Train Status Tools ====================
@@ -440,35 +455,41 @@ async def get_full_journey_status(pnr_no: str) -> str:
         pnr_no: 10-digit PNR code
     """
     # Fetch PNR status
-    pnr_response = fetch_pnr_status(pnr_no)
+    pnr_response = await fetch_pnr_status(pnr_no)
     if pnr_response is None:
-        return "Error fetching PNR status. Please double check the PNR number provided."
+        return _PNR_ERROR
     
-    # Get PNR summary
-    result = get_pnr_summary(pnr_response)
+    # Extract train number and start_day first so the live-status fetch can
+    # be launched before the (CPU-only) PNR summary formatting below.
+    train_no = get_train_number(pnr_response)
+    train_source_date = get_pnr_train_start_date(pnr_response)
+    today = date.today()  # One consistent date for the whole request
+    start_day = calculate_start_day(train_source_date, today)
+
+    train_task = None
+    if train_no is not None and not (train_source_date and train_source_date > today):
+        train_task = asyncio.create_task(fetch_new_train_status(train_no, start_day))
+
+    # Format the PNR summary off the event loop while the train-status
+    # request is in flight, so neither blocks the other.
+    result = await asyncio.to_thread(get_pnr_summary, pnr_response)
     result += "\n" + "=" * 40 + "\n"
     result += "LIVE TRAIN STATUS\n"
     result += "=" * 40 + "\n\n"
-    
-    # Get train status
-    train_no = get_train_number(pnr_response)
+
     if train_no is None:
         result += "Train number not available in PNR data."
         return result
-    
-    # Calculate start_day
-    train_source_date = get_pnr_train_start_date(pnr_response)
-    start_day = calculate_start_day(train_source_date)
-    
+
     # Check if the journey date is in the future
-    if train_source_date and train_source_date > date.today():
+    if train_source_date and train_source_date > today:
         result += f"🚂 Train has not started yet.\n"
         result += f"📅 Scheduled departure from source: {train_source_date.strftime('%d-%m-%Y')}\n"
-        result += f"⏳ Days until departure: {(train_source_date - date.today()).days}"
+        result += f"⏳ Days until departure: {(train_source_date - today).days}"
         return result
-    
-    # Fetch live train status
-    train_response = await fetch_new_train_status(train_no, start_day)
+
+    # Collect the live train status launched above
+    train_response = await train_task
     if train_response is None:
         result += f"Unable to fetch live status for train {train_no}.\n"
         result += f"Train source date: {train_source_date.strftime('%d-%m-%Y') if train_source_date else 'Unknown'}\n"
@@ -485,7 +506,19 @@ async def get_full_journey_status(pnr_no: str) -> str:
 
 
 def main():
-    mcp.run()
+    transport = os.getenv("MCP_TRANSPORT", "stdio")
+    if transport in ("http", "streamable-http"):
+        # Stateless streamable-HTTP for multi-client deployments; the shared
+        # upstream httpx clients are module-level, so nothing is rebuilt per
+        # request.
+        mcp.run(
+            transport="http",
+            host=os.getenv("MCP_HOST", "127.0.0.1"),
+            port=int(os.getenv("MCP_PORT", "8000")),
+            stateless_http=True,
+        )
+    else:
+        mcp.run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+"""Shared fixtures for the test suite."""
+
+import asyncio
+import os
+
+import httpx
+import orjson
+import pytest
+from dotenv import load_dotenv
+
+# Load .env (if present) first so real API config wins over the offline
+# defaults below; they only fill the gaps so lib.pnr / lib.train import
+# fully configured and their requests route into the replay transport.
+load_dotenv()
+os.environ.setdefault("NEW_PNR_API_PATH", "https://pnr-api.invalid/pnr")
+os.environ.setdefault("NEW_PNR_API_KEY_NAME", "XSRF-TOKEN")
+os.environ.setdefault("NEW_TRAIN_STATUS_API_BASE", "https://train-api.invalid/live-train-status")
+os.environ.setdefault("TRAIN_STATUS_API_BASE", "https://train-api.invalid/status")
+
+from lib import http_client
+from lib.pnr import fetch_pnr_status
+
+from lib.schema.train import (
+    NewTrainStatusResponse,
+    PreviousStation,
+    UpcomingStation,
+)
+
+# Get the directory where the tests live
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(TEST_DIR)
+
+EXAMPLE_TRAIN_STATUS_FILE = os.path.join(
+    PROJECT_ROOT, "lib", "example_api_responses", "train_status.json"
+)
+EXAMPLE_PNR_FILE = os.path.join(
+    PROJECT_ROOT, "lib", "example_api_responses", "pnr.json"
+)
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+def _offline_handler(request: httpx.Request) -> httpx.Response:
+    """Replay the committed example API responses in place of the live services."""
+    url = str(request.url)
+
+    if url.startswith(os.environ["NEW_PNR_API_PATH"]):
+        if request.method == "GET":
+            # Token bootstrap: hand out the XSRF cookie like the real endpoint
+            key_name = os.environ["NEW_PNR_API_KEY_NAME"]
+            return httpx.Response(
+                200, headers={"set-cookie": f"{key_name}=offline-token; Path=/"}
+            )
+        pnr_no = orjson.loads(request.content)["pnr"]
+        if pnr_no == "0000000000":
+            # Non-existent PNR: the live API answers with status=False
+            body = {"status": False, "message": "PNR not found", "timestamp": 0, "data": None}
+            return httpx.Response(200, content=orjson.dumps(body), headers=_JSON_HEADERS)
+        with open(EXAMPLE_PNR_FILE, "rb") as f:
+            payload = orjson.loads(f.read())
+        payload["data"]["Pnr"] = pnr_no
+        return httpx.Response(200, content=orjson.dumps(payload), headers=_JSON_HEADERS)
+
+    if url.startswith(os.environ["NEW_TRAIN_STATUS_API_BASE"]):
+        # URL shape: {base}/{train_number}/json
+        train_number = request.url.path.rsplit("/", 2)[-2]
+        if train_number == "99999":
+            # Unknown train: a bare failure payload, as the live API returns
+            return httpx.Response(
+                200, content=orjson.dumps({"success": False}), headers=_JSON_HEADERS
+            )
+        with open(EXAMPLE_TRAIN_STATUS_FILE, "rb") as f:
+            payload = orjson.loads(f.read())
+        payload["train_number"] = train_number
+        return httpx.Response(200, content=orjson.dumps(payload), headers=_JSON_HEADERS)
+
+    return httpx.Response(404)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def offline_transport():
+    """
+    Point the shared client at a MockTransport replaying the example API
+    responses, so the integration tests run without touching the network.
+    Set LIVE_API_TESTS=1 to exercise the real APIs instead.
+    """
+    if os.getenv("LIVE_API_TESTS"):
+        yield
+        return
+    http_client._client = httpx.AsyncClient(transport=httpx.MockTransport(_offline_handler))
+    yield
+    http_client._client = None
+
+# Test PNR number (keep in sync with tests/pnr.py)
+TEST_PNR = "8641842491"
+
+
+@pytest.fixture(scope="session")
+def pnr_status(offline_transport):
+    """PNR status for TEST_PNR, fetched once for the whole session."""
+    return asyncio.run(fetch_pnr_status(TEST_PNR))
+
+
+def _construct_station(model, station: dict):
+    """model_construct one station dict; non_stops stay dicts (TypedDict)."""
+    station = dict(station)
+    station["non_stops"] = station.get("non_stops") or []
+    return model.model_construct(**station)
+
+
+def construct_train_status_response(data: dict) -> NewTrainStatusResponse:
+    """
+    Build a NewTrainStatusResponse from trusted fixture data with
+    model_construct, skipping pydantic validation of the deeply nested
+    station lists. test_example_json_validates still runs full validation.
+    """
+    data = dict(data)
+    data["upcoming_stations"] = [
+        _construct_station(UpcomingStation, s) for s in data.get("upcoming_stations") or []
+    ]
+    data["previous_stations"] = [
+        _construct_station(PreviousStation, s) for s in data.get("previous_stations") or []
+    ]
+    # bubble_message / next_stoppage_info / ttb_card / current_location_info /
+    # dfp_carousel are plain dicts now and pass through as-is
+    return NewTrainStatusResponse.model_construct(**data)
+
+
+@pytest.fixture(scope="session")
+def example_response() -> NewTrainStatusResponse:
+    """The example train-status response, parsed once for the whole session."""
+    with open(EXAMPLE_TRAIN_STATUS_FILE, "rb") as f:
+        data = orjson.loads(f.read())
+    return construct_train_status_response(data)
@@ -1,3 +1,6 @@
+import asyncio
+import sys
+
 from lib.pnr import (
     fetch_pnr_status,
     get_train_start_date,
@@ -21,7 +24,7 @@ def test_fetch_pnr_status():
     """Test fetching PNR status from the API."""
     pnr_no = TEST_PNR
     
-    result = fetch_pnr_status(pnr_no)
+    result = asyncio.run(fetch_pnr_status(pnr_no))
     
     # Verify return type
     assert isinstance(result, PNRResponse)
@@ -50,37 +53,35 @@ def test_fetch_pnr_status():
 def test_invalid_length_pnr():
     """Test that PNR with invalid length returns None without API call."""
     # Too short
-    assert fetch_pnr_status("123456789") is None
+    assert asyncio.run(fetch_pnr_status("123456789")) is None
     print("✓ 9 digit PNR returns None")
     
     # Too long
-    assert fetch_pnr_status("12345678901") is None
+    assert asyncio.run(fetch_pnr_status("12345678901")) is None
     print("✓ 11 digit PNR returns None")
     
     # Empty
-    assert fetch_pnr_status("") is None
+    assert asyncio.run(fetch_pnr_status("")) is None
     print("✓ Empty PNR returns None")
     
     # Non-numeric
-    assert fetch_pnr_status("abcdefghij") is None
+    assert asyncio.run(fetch_pnr_status("abcdefghij")) is None
     print("✓ Non-numeric PNR returns None")
     
     # Mixed
-    assert fetch_pnr_status("12345abcde") is None
+    assert asyncio.run(fetch_pnr_status("12345abcde")) is None
     print("✓ Mixed alphanumeric PNR returns None")
 
 
 def test_invalid_pnr_value():
     """Test that valid format but non-existent PNR returns None."""
-    result = fetch_pnr_status("0000000000")
+    result = asyncio.run(fetch_pnr_status("0000000000"))
     assert result is None
     print("✓ Invalid PNR (0000000000) returns None")
 
 
-def test_get_train_start_date():
+def test_get_train_start_date(pnr_status):
     """Test getting train start date from PNR."""
-    pnr_status = fetch_pnr_status(TEST_PNR)
-    
     result = get_train_start_date(pnr_status)
     
     # Should return a date object
@@ -98,10 +99,8 @@ def test_get_train_start_date_none():
     print("✓ get_train_start_date(None) returns None")
 
 
-def test_get_train_number():
+def test_get_train_number(pnr_status):
     """Test getting train number from PNR."""
-    pnr_status = fetch_pnr_status(TEST_PNR)
-    
     result = get_train_number(pnr_status)
     
     assert result is not None
@@ -118,10 +117,8 @@ def test_get_train_number_none():
     print("✓ get_train_number(None) returns None")
 
 
-def test_check_confirm_status():
+def test_check_confirm_status(pnr_status):
     """Test checking confirmation status of passengers."""
-    pnr_status = fetch_pnr_status(TEST_PNR)
-    
     result = check_confirm_status(pnr_status)
     
     assert result is not None
@@ -138,10 +135,8 @@ def test_check_confirm_status_none():
     print("✓ check_confirm_status(None) returns appropriate message")
 
 
-def test_get_coach_and_berth():
+def test_get_coach_and_berth(pnr_status):
     """Test getting coach and berth details."""
-    pnr_status = fetch_pnr_status(TEST_PNR)
-    
     result = get_coach_and_berth(pnr_status)
     
     assert result is not None
@@ -158,10 +153,8 @@ def test_get_coach_and_berth_none():
     print("✓ get_coach_and_berth(None) returns appropriate message")
 
 
-def test_get_waitlist_position():
+def test_get_waitlist_position(pnr_status):
     """Test getting waitlist position."""
-    pnr_status = fetch_pnr_status(TEST_PNR)
-    
     result = get_waitlist_position(pnr_status)
     
     assert result is not None
@@ -178,10 +171,8 @@ def test_get_waitlist_position_none():
     print("✓ get_waitlist_position(None) returns appropriate message")
 
 
-def test_get_journey_overview():
+def test_get_journey_overview(pnr_status):
     """Test getting journey overview."""
-    pnr_status = fetch_pnr_status(TEST_PNR)
-    
     result = get_journey_overview(pnr_status)
     
     assert result is not None
@@ -201,10 +192,8 @@ def test_get_journey_overview_none():
     print("✓ get_journey_overview(None) returns appropriate message")
 
 
-def test_get_passenger_summary():
+def test_get_passenger_summary(pnr_status):
     """Test getting passenger summary."""
-    pnr_status = fetch_pnr_status(TEST_PNR)
-    
     result = get_passenger_summary(pnr_status)
     
     assert result is not None
@@ -223,10 +212,8 @@ def test_get_passenger_summary_none():
     print("✓ get_passenger_summary(None) returns appropriate message")
 
 
-def test_get_pnr_summary():
+def test_get_pnr_summary(pnr_status):
     """Test getting complete PNR summary."""
-    pnr_status = fetch_pnr_status(TEST_PNR)
-    
     result = get_pnr_summary(pnr_status)
     
     assert result is not None
@@ -247,77 +234,64 @@ def test_get_pnr_summary_none():
 
 
 if __name__ == "__main__":
-    print("=" * 50)
-    print("Test 1: Valid PNR Fetch")
-    print("=" * 50)
+    _BANNER = "=" * 50
+
+    def _print_banner(title: str) -> None:
+        # One write per banner instead of three separate print syscalls
+        sys.stdout.write(f"{_BANNER}\n{title}\n{_BANNER}\n")
+
+    _print_banner("Test 1: Valid PNR Fetch")
     test_fetch_pnr_status()
     print("\n✅ Valid PNR test passed!\n")
     
-    print("=" * 50)
-    print("Test 2: Invalid length PNR")
-    print("=" * 50)
+    _print_banner("Test 2: Invalid length PNR")
     test_invalid_length_pnr()
     print("\n✅ Invalid length PNR test passed!\n")
     
-    print("=" * 50)
-    print("Test 3: Invalid PNR value")
-    print("=" * 50)
+    _print_banner("Test 3: Invalid PNR value")
     test_invalid_pnr_value()
     print("\n✅ Invalid PNR value test passed!\n")
     
-    print("=" * 50)
-    print("Test 4: Get Train Start Date")
-    print("=" * 50)
-    test_get_train_start_date()
+    # Fetch the test PNR once and reuse it for all formatter tests below
+    pnr_status = asyncio.run(fetch_pnr_status(TEST_PNR))
+
+    _print_banner("Test 4: Get Train Start Date")
+    test_get_train_start_date(pnr_status)
     test_get_train_start_date_none()
     print("\n✅ Train start date tests passed!\n")
     
-    print("=" * 50)
-    print("Test 5: Get Train Number")
-    print("=" * 50)
-    test_get_train_number()
+    _print_banner("Test 5: Get Train Number")
+    test_get_train_number(pnr_status)
     test_get_train_number_none()
     print("\n✅ Train number tests passed!\n")
     
-    print("=" * 50)
-    print("Test 6: Check Confirm Status")
-    print("=" * 50)
-    test_check_confirm_status()
+    _print_banner("Test 6: Check Confirm Status")
+    test_check_confirm_status(pnr_status)
     test_check_confirm_status_none()
     print("\n✅ Confirm status tests passed!\n")
     
-    print("=" * 50)
-    print("Test 7: Get Coach and Berth")
-    print("=" * 50)
-    test_get_coach_and_berth()
+    _print_banner("Test 7: Get Coach and Berth")
+    test_get_coach_and_berth(pnr_status)
     test_get_coach_and_berth_none()
     print("\n✅ Coach and berth tests passed!\n")
     
-    print("=" * 50)
-    print("Test 8: Get Waitlist Position")
-    print("=" * 50)
-    test_get_waitlist_position()
+    _print_banner("Test 8: Get Waitlist Position")
+    test_get_waitlist_position(pnr_status)
     test_get_waitlist_position_none()
     print("\n✅ Waitlist position tests passed!\n")
     
-    print("=" * 50)
-    print("Test 9: Get Journey Overview")
-    print("=" * 50)
-    test_get_journey_overview()
+    _print_banner("Test 9: Get Journey Overview")
+    test_get_journey_overview(pnr_status)
     test_get_journey_overview_none()
     print("\n✅ Journey overview tests passed!\n")
     
-    print("=" * 50)
-    print("Test 10: Get Passenger Summary")
-    print("=" * 50)
-    test_get_passenger_summary()
+    _print_banner("Test 10: Get Passenger Summary")
+    test_get_passenger_summary(pnr_status)
     test_get_passenger_summary_none()
     print("\n✅ Passenger summary tests passed!\n")
     
-    print("=" * 50)
-    print("Test 11: Get PNR Summary")
-    print("=" * 50)
-    test_get_pnr_summary()
+    _print_banner("Test 11: Get PNR Summary")
+    test_get_pnr_summary(pnr_status)
     test_get_pnr_summary_none()
     print("\n✅ PNR summary tests passed!\n")
     